@@ -1,15 +1,29 @@
 import os
+import sys
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config, pool
+from sqlalchemy.engine import make_url
 from alembic import context
 
 config = context.config
 
+# make alembic/migration_helpers.py importable from revision scripts
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
 # allow DATABASE_URL override and strip async driver if present
 env_url = os.getenv("DATABASE_URL")
 if env_url:
     env_url = env_url.replace("+asyncpg", "")
+    # route migrations through PgBouncer's session pool so the runner reuses
+    # an already-authenticated server connection instead of a fresh backend
+    if os.getenv("USE_SESSION_POOLER") == "1":
+        pooler_port = int(os.getenv("PGBOUNCER_PORT", "6432"))
+        env_url = (
+            make_url(env_url)
+            .set(port=pooler_port)
+            .render_as_string(hide_password=False)
+        )
     config.set_main_option("sqlalchemy.url", env_url)
 
 if config.config_file_name is not None:
@@ -20,6 +34,8 @@ if config.config_file_name is not None:
 # target_metadata = Base.metadata
 target_metadata = None
 
+MIGRATION_LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+
 
 def run_migrations_offline():
     url = config.get_main_option("sqlalchemy.url")
@@ -29,13 +45,32 @@ def run_migrations_offline():
 
 
 def run_migrations_online():
+    # One connection is checked out for the whole run; migrations that need
+    # it should use op.get_bind() rather than opening their own.
     connectable = engine_from_config(
         config.get_section(config.config_ini_section),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        pool_pre_ping=False,
     )
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        # Serialize concurrent runners (parallel CI jobs, rolling pods) on a
+        # session advisory lock; Postgres releases it when the connection
+        # closes. lock_timeout is only set once we hold it, so a waiting
+        # runner queues behind the current one but the DDL itself fails fast
+        # if some other session is sitting on a table lock. Concurrent index
+        # builds lift it again (migration_helpers.concurrent_ddl).
+        connection.exec_driver_sql(
+            "SELECT pg_advisory_lock(hashtext('tickertap_alembic'))"
+        )
+        connection.exec_driver_sql(f"SET lock_timeout = '{MIGRATION_LOCK_TIMEOUT}'")
+        # Commit each revision on its own so earlier migrations release
+        # their locks before later ones start.
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True,
+        )
         with context.begin_transaction():
             context.run_migrations()
 
@@ -0,0 +1,80 @@
+"""
+Shared helpers for migration scripts.
+
+env.py puts this directory on sys.path, so revisions can simply
+`from migration_helpers import bulk_insert_pipelined`.
+"""
+
+from contextlib import contextmanager
+
+import sqlalchemy as sa
+from alembic import context, op
+from psycopg2.extras import execute_values
+
+
+def bulk_insert_pipelined(table_name, columns, rows, chunk=1000):
+    """Insert `rows` (sequences ordered like `columns`) into `table_name`.
+
+    Rows are sent as one multi-row INSERT ... VALUES statement per `chunk`
+    rows instead of one round-trip per row, which is what op.bulk_insert
+    does on psycopg2.
+    """
+    if context.is_offline_mode():
+        table = sa.table(table_name, *(sa.column(c) for c in columns))
+        op.bulk_insert(table, [dict(zip(columns, row)) for row in rows])
+        return
+
+    bind = op.get_bind()
+    quote = bind.dialect.identifier_preparer.quote
+    statement = "INSERT INTO {} ({}) VALUES %s".format(
+        quote(table_name), ", ".join(quote(c) for c in columns)
+    )
+    cursor = bind.connection.cursor()
+    try:
+        execute_values(cursor, statement, rows, page_size=chunk)
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def concurrent_ddl():
+    """op.get_context().autocommit_block() with env.py's lock_timeout lifted.
+
+    CREATE INDEX CONCURRENTLY waits on every transaction that could still see
+    the table. Under the session lock_timeout such a wait fails the build and
+    leaves an INVALID index behind, and these statements only take SHARE
+    UPDATE EXCLUSIVE, so writers are not blocked while they wait.
+    """
+    with op.get_context().autocommit_block():
+        if context.is_offline_mode():
+            yield
+            return
+        bind = op.get_bind()
+        previous = bind.exec_driver_sql("SHOW lock_timeout").scalar()
+        bind.exec_driver_sql("SET lock_timeout = 0")
+        try:
+            yield
+        finally:
+            bind.exec_driver_sql(f"SET lock_timeout = '{previous}'")
+
+
+def create_index_concurrently(name, definition):
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS `name` `definition`.
+
+    A failed concurrent build leaves an INVALID index under `name`, which
+    IF NOT EXISTS would then skip; drop that leftover and build it again.
+    Call inside concurrent_ddl().
+    """
+    if not context.is_offline_mode():
+        rows = op.get_bind().execute(
+            sa.text(
+                "SELECT 1 FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND pg_table_is_visible(c.oid) "
+                "AND NOT i.indisvalid"
+            ),
+            {"name": name},
+        )
+        if rows.first() is not None:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}")
@@ -6,219 +6,184 @@ Create Date: 2026-01-09 00:00:00.000000
 """
 
 from alembic import op
-import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql
 
 revision = "0001_initial"
 down_revision = None
 branch_labels = None
 depends_on = None
 
-
-def upgrade():
-    op.execute('CREATE EXTENSION IF NOT EXISTS "pgcrypto";')
-
-    op.create_table(
-        "users",
-        sa.Column(
-            "user_id",
-            postgresql.UUID(as_uuid=True),
-            primary_key=True,
-            server_default=sa.text("gen_random_uuid()"),
-        ),
-        sa.Column("email", sa.String(255), nullable=False, unique=True),
-        sa.Column("password_hash", sa.String(255), nullable=False),
-        sa.Column("first_name", sa.String(100)),
-        sa.Column("last_name", sa.String(100)),
-        sa.Column("phone", sa.String(20)),
-        sa.Column("kyc_status", sa.String(20), server_default="pending"),
-        sa.Column(
-            "created_at", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP")
-        ),
-        sa.Column(
-            "updated_at", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP")
-        ),
-        sa.Column("is_active", sa.Boolean(), server_default=sa.text("true")),
+EXTENSIONS_SQL = 'CREATE EXTENSION IF NOT EXISTS "pgcrypto"'
+
+# Phase A: tables with no foreign keys, so their order does not matter.
+PHASE_A_TABLES = [
+    """
+    CREATE TABLE users (
+        user_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        email VARCHAR(255) NOT NULL UNIQUE,
+        password_hash VARCHAR(255) NOT NULL,
+        first_name VARCHAR(100),
+        last_name VARCHAR(100),
+        phone VARCHAR(20),
+        kyc_status VARCHAR(20) DEFAULT 'pending',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        is_active BOOLEAN DEFAULT true
     )
-    op.create_index("idx_users_email", "users", ["email"])
-
-    op.create_table(
-        "accounts",
-        sa.Column(
-            "account_id",
-            postgresql.UUID(as_uuid=True),
-            primary_key=True,
-            server_default=sa.text("gen_random_uuid()"),
-        ),
-        sa.Column(
-            "user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.user_id")
-        ),
-        sa.Column("account_type", sa.String(50), nullable=False),
-        sa.Column("account_number", sa.String(50), nullable=False, unique=True),
-        sa.Column("balance", sa.Numeric(18, 2), server_default="0.00"),
-        sa.Column("currency", sa.String(3), server_default="'USD'"),
-        sa.Column("status", sa.String(20), server_default="'active'"),
-        sa.Column(
-            "created_at", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP")
-        ),
-        sa.Column(
-            "updated_at", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP")
-        ),
+    """,
+    """
+    CREATE TABLE accounts (
+        account_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        user_id UUID,
+        account_type VARCHAR(50) NOT NULL,
+        account_number VARCHAR(50) NOT NULL UNIQUE,
+        balance NUMERIC(18, 2) DEFAULT 0.00,
+        currency VARCHAR(3) DEFAULT 'USD',
+        status VARCHAR(20) DEFAULT 'active',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )
-    op.create_index("idx_accounts_user_id", "accounts", ["user_id"])
-
-    op.create_table(
-        "transactions",
-        sa.Column(
-            "transaction_id",
-            postgresql.UUID(as_uuid=True),
-            primary_key=True,
-            server_default=sa.text("gen_random_uuid()"),
-        ),
-        sa.Column(
-            "account_id",
-            postgresql.UUID(as_uuid=True),
-            sa.ForeignKey("accounts.account_id"),
-        ),
-        sa.Column("transaction_type", sa.String(20), nullable=False),
-        sa.Column("amount", sa.Numeric(18, 2), nullable=False),
-        sa.Column("currency", sa.String(3), server_default="'USD'"),
-        sa.Column("status", sa.String(20), server_default="'pending'"),
-        sa.Column("description", sa.Text()),
-        sa.Column("reference_number", sa.String(100), unique=True),
-        sa.Column("executed_at", sa.TIMESTAMP()),
-        sa.Column(
-            "created_at", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP")
-        ),
+    """,
+    """
+    CREATE TABLE transactions (
+        transaction_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        account_id UUID,
+        transaction_type VARCHAR(20) NOT NULL,
+        amount NUMERIC(18, 2) NOT NULL,
+        currency VARCHAR(3) DEFAULT 'USD',
+        status VARCHAR(20) DEFAULT 'pending',
+        description TEXT,
+        reference_number VARCHAR(100) UNIQUE,
+        executed_at TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )
-    op.create_index("idx_transactions_account_id", "transactions", ["account_id"])
-    op.create_index("idx_transactions_created_at", "transactions", ["created_at"])
-
-    op.create_table(
-        "securities",
-        sa.Column(
-            "security_id",
-            postgresql.UUID(as_uuid=True),
-            primary_key=True,
-            server_default=sa.text("gen_random_uuid()"),
-        ),
-        sa.Column("symbol", sa.String(10), nullable=False, unique=True),
-        sa.Column("name", sa.String(255), nullable=False),
-        sa.Column("security_type", sa.String(50), nullable=False),
-        sa.Column("exchange", sa.String(50)),
-        sa.Column("currency", sa.String(3), server_default="'USD'"),
-        sa.Column("is_active", sa.Boolean(), server_default=sa.text("true")),
-        sa.Column(
-            "created_at", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP")
-        ),
+    """,
+    """
+    CREATE TABLE securities (
+        security_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        symbol VARCHAR(10) NOT NULL UNIQUE,
+        name VARCHAR(255) NOT NULL,
+        security_type VARCHAR(50) NOT NULL,
+        exchange VARCHAR(50),
+        currency VARCHAR(3) DEFAULT 'USD',
+        is_active BOOLEAN DEFAULT true,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )
-
-    op.create_table(
-        "holdings",
-        sa.Column(
-            "holding_id",
-            postgresql.UUID(as_uuid=True),
-            primary_key=True,
-            server_default=sa.text("gen_random_uuid()"),
-        ),
-        sa.Column(
-            "account_id",
-            postgresql.UUID(as_uuid=True),
-            sa.ForeignKey("accounts.account_id"),
-        ),
-        sa.Column(
-            "security_id",
-            postgresql.UUID(as_uuid=True),
-            sa.ForeignKey("securities.security_id"),
-        ),
-        sa.Column("quantity", sa.Numeric(18, 6), nullable=False),
-        sa.Column("average_cost", sa.Numeric(18, 2)),
-        sa.Column("current_price", sa.Numeric(18, 2)),
-        sa.Column(
-            "last_updated", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP")
-        ),
+    """,
+    """
+    CREATE TABLE holdings (
+        holding_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        account_id UUID,
+        security_id UUID,
+        quantity NUMERIC(18, 6) NOT NULL,
+        average_cost NUMERIC(18, 2),
+        current_price NUMERIC(18, 2),
+        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT uq_holdings_account_security UNIQUE (account_id, security_id)
     )
-    op.create_index("idx_holdings_account_id", "holdings", ["account_id"])
-    op.create_unique_constraint(
-        "uq_holdings_account_security", "holdings", ["account_id", "security_id"]
+    """,
+    """
+    CREATE TABLE orders (
+        order_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        account_id UUID,
+        security_id UUID,
+        order_type VARCHAR(20) NOT NULL,
+        side VARCHAR(10) NOT NULL,
+        quantity NUMERIC(18, 6) NOT NULL,
+        price NUMERIC(18, 2),
+        status VARCHAR(20) DEFAULT 'pending',
+        filled_quantity NUMERIC(18, 6) DEFAULT 0,
+        filled_price NUMERIC(18, 2),
+        placed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        executed_at TIMESTAMP,
+        cancelled_at TIMESTAMP
     )
-
-    op.create_table(
-        "orders",
-        sa.Column(
-            "order_id",
-            postgresql.UUID(as_uuid=True),
-            primary_key=True,
-            server_default=sa.text("gen_random_uuid()"),
-        ),
-        sa.Column(
-            "account_id",
-            postgresql.UUID(as_uuid=True),
-            sa.ForeignKey("accounts.account_id"),
-        ),
-        sa.Column(
-            "security_id",
-            postgresql.UUID(as_uuid=True),
-            sa.ForeignKey("securities.security_id"),
-        ),
-        sa.Column("order_type", sa.String(20), nullable=False),
-        sa.Column("side", sa.String(10), nullable=False),
-        sa.Column("quantity", sa.Numeric(18, 6), nullable=False),
-        sa.Column("price", sa.Numeric(18, 2)),
-        sa.Column("status", sa.String(20), server_default="'pending'"),
-        sa.Column("filled_quantity", sa.Numeric(18, 6), server_default="0"),
-        sa.Column("filled_price", sa.Numeric(18, 2)),
-        sa.Column(
-            "placed_at", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP")
-        ),
-        sa.Column("executed_at", sa.TIMESTAMP()),
-        sa.Column("cancelled_at", sa.TIMESTAMP()),
+    """,
+    """
+    CREATE TABLE audit_log (
+        log_id BIGSERIAL PRIMARY KEY,
+        user_id UUID,
+        action VARCHAR(100) NOT NULL,
+        table_name VARCHAR(100),
+        record_id UUID,
+        old_values JSONB,
+        new_values JSONB,
+        ip_address INET,
+        user_agent TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )
-    op.create_index("idx_orders_account_id", "orders", ["account_id"])
-    op.create_index("idx_orders_status", "orders", ["status"])
+    """,
+]
+
+# Phase B: foreign keys and indexes, once every table exists. Constraint
+# names match the ones Postgres generates for inline REFERENCES clauses.
+PHASE_B_CONSTRAINTS = [
+    (
+        "ALTER TABLE accounts ADD CONSTRAINT accounts_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users (user_id)"
+    ),
+    (
+        "ALTER TABLE transactions ADD CONSTRAINT transactions_account_id_fkey "
+        "FOREIGN KEY (account_id) REFERENCES accounts (account_id)"
+    ),
+    (
+        "ALTER TABLE holdings ADD CONSTRAINT holdings_account_id_fkey "
+        "FOREIGN KEY (account_id) REFERENCES accounts (account_id)"
+    ),
+    (
+        "ALTER TABLE holdings ADD CONSTRAINT holdings_security_id_fkey "
+        "FOREIGN KEY (security_id) REFERENCES securities (security_id)"
+    ),
+    (
+        "ALTER TABLE orders ADD CONSTRAINT orders_account_id_fkey "
+        "FOREIGN KEY (account_id) REFERENCES accounts (account_id)"
+    ),
+    (
+        "ALTER TABLE orders ADD CONSTRAINT orders_security_id_fkey "
+        "FOREIGN KEY (security_id) REFERENCES securities (security_id)"
+    ),
+    (
+        "ALTER TABLE audit_log ADD CONSTRAINT audit_log_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users (user_id)"
+    ),
+    "CREATE INDEX idx_users_email ON users (email)",
+    "CREATE INDEX idx_accounts_user_id ON accounts (user_id)",
+    "CREATE INDEX idx_transactions_account_id ON transactions (account_id)",
+    "CREATE INDEX idx_transactions_created_at ON transactions (created_at)",
+    "CREATE INDEX idx_holdings_account_id ON holdings (account_id)",
+    "CREATE INDEX idx_orders_account_id ON orders (account_id)",
+    "CREATE INDEX idx_orders_status ON orders (status)",
+    "CREATE INDEX idx_audit_log_user_id ON audit_log (user_id)",
+    "CREATE INDEX idx_audit_log_created_at ON audit_log (created_at)",
+]
+
+
+def _join(statements):
+    return ";\n".join(s.strip() for s in statements) + ";"
+
+
+# The whole schema is sent as one multi-statement string so the server
+# receives a single Simple Query message instead of one round-trip per
+# CREATE TABLE / CREATE INDEX.
+INITIAL_SCHEMA_SQL = _join([EXTENSIONS_SQL, *PHASE_A_TABLES, *PHASE_B_CONSTRAINTS])
+
+# Dropping a table also drops its indexes and constraints, so the downgrade
+# only needs the tables in reverse dependency order.
+DROP_INITIAL_SCHEMA_SQL = _join(
+    [
+        "DROP TABLE audit_log",
+        "DROP TABLE orders",
+        "DROP TABLE holdings",
+        "DROP TABLE securities",
+        "DROP TABLE transactions",
+        "DROP TABLE accounts",
+        "DROP TABLE users",
+    ]
+)
 
-    op.create_table(
-        "audit_log",
-        sa.Column("log_id", sa.BigInteger(), primary_key=True, autoincrement=True),
-        sa.Column(
-            "user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.user_id")
-        ),
-        sa.Column("action", sa.String(100), nullable=False),
-        sa.Column("table_name", sa.String(100)),
-        sa.Column("record_id", postgresql.UUID(as_uuid=True)),
-        sa.Column("old_values", postgresql.JSONB),
-        sa.Column("new_values", postgresql.JSONB),
-        sa.Column("ip_address", postgresql.INET),
-        sa.Column("user_agent", sa.Text()),
-        sa.Column(
-            "created_at", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP")
-        ),
-    )
-    op.create_index("idx_audit_log_user_id", "audit_log", ["user_id"])
-    op.create_index("idx_audit_log_created_at", "audit_log", ["created_at"])
 
+def upgrade():
+    op.execute(INITIAL_SCHEMA_SQL)
 
-def downgrade():
-    op.drop_index("idx_audit_log_created_at", table_name="audit_log")
-    op.drop_index("idx_audit_log_user_id", table_name="audit_log")
-    op.drop_table("audit_log")
-
-    op.drop_index("idx_orders_status", table_name="orders")
-    op.drop_index("idx_orders_account_id", table_name="orders")
-    op.drop_table("orders")
-
-    op.drop_constraint("uq_holdings_account_security", "holdings", type_="unique")
-    op.drop_index("idx_holdings_account_id", table_name="holdings")
-    op.drop_table("holdings")
-
-    op.drop_table("securities")
-
-    op.drop_index("idx_transactions_created_at", table_name="transactions")
-    op.drop_index("idx_transactions_account_id", table_name="transactions")
-    op.drop_table("transactions")
-
-    op.drop_index("idx_accounts_user_id", table_name="accounts")
-    op.drop_table("accounts")
 
-    op.drop_index("idx_users_email", table_name="users")
-    op.drop_table("users")
+def downgrade():
+    op.execute(DROP_INITIAL_SCHEMA_SQL)
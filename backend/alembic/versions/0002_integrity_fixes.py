@@ -0,0 +1,284 @@
+"""integrity fixes
+
+Revision ID: 0002_integrity_fixes
+Revises: 0001_initial
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from collections import defaultdict
+
+import sqlalchemy as sa
+from alembic import context, op
+from migration_helpers import concurrent_ddl, create_index_concurrently
+
+revision = "0002_integrity_fixes"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+# (table, generated name, new name, column, referenced table(column), on delete)
+FOREIGN_KEYS = [
+    (
+        "accounts",
+        "accounts_user_id_fkey",
+        "fk_accounts_user_id",
+        "user_id",
+        "users (user_id)",
+        "CASCADE",
+    ),
+    (
+        "transactions",
+        "transactions_account_id_fkey",
+        "fk_transactions_account_id",
+        "account_id",
+        "accounts (account_id)",
+        "CASCADE",
+    ),
+    (
+        "holdings",
+        "holdings_account_id_fkey",
+        "fk_holdings_account_id",
+        "account_id",
+        "accounts (account_id)",
+        "CASCADE",
+    ),
+    (
+        "orders",
+        "orders_account_id_fkey",
+        "fk_orders_account_id",
+        "account_id",
+        "accounts (account_id)",
+        "CASCADE",
+    ),
+    # audit history outlives the user it refers to
+    (
+        "audit_log",
+        "audit_log_user_id_fkey",
+        "fk_audit_log_user_id",
+        "user_id",
+        "users (user_id)",
+        "SET NULL",
+    ),
+]
+
+# (table, column) pairs the models already declare as non-nullable
+NOT_NULL_COLUMNS = [
+    ("accounts", "user_id"),
+    ("transactions", "account_id"),
+    ("holdings", "account_id"),
+    ("holdings", "security_id"),
+    ("orders", "account_id"),
+    ("orders", "security_id"),
+]
+
+
+# Databases created before 0001_initial was rewritten as plain SQL carry
+# double-quoted defaults such as '''USD''' on these columns.
+COLUMN_DEFAULTS = [
+    ("accounts", "currency", "'USD'"),
+    ("accounts", "status", "'active'"),
+    ("transactions", "currency", "'USD'"),
+    ("transactions", "status", "'pending'"),
+    ("securities", "currency", "'USD'"),
+    ("orders", "status", "'pending'"),
+]
+
+# (table, constraint name, condition)
+CHECK_CONSTRAINTS = [
+    ("accounts", "ck_accounts_balance_non_negative", "balance >= 0"),
+    ("transactions", "ck_transactions_amount_positive", "amount > 0"),
+    ("holdings", "ck_holdings_quantity_positive", "quantity > 0"),
+    ("orders", "ck_orders_quantity_positive", "quantity > 0"),
+]
+
+# (index name, table, columns)
+COMPOSITE_INDEXES = [
+    ("idx_transactions_account_created", "transactions", "account_id, created_at"),
+    ("idx_orders_account_status", "orders", "account_id, status"),
+]
+
+# Only pending orders are ever looked up by state, and once filled and
+# cancelled orders accumulate they are a small fraction of the table. This
+# partial index replaces the full-table idx_orders_status.
+PENDING_ORDERS_INDEX = (
+    "idx_orders_pending",
+    "ON orders (account_id, placed_at) WHERE status = 'pending'",
+)
+
+# (index name, table, columns) of 0001 indexes whose column is the leading
+# column of a composite index above (or of uq_holdings_account_security),
+# so every lookup they serve can use the wider index instead.
+REDUNDANT_INDEXES = [
+    ("idx_transactions_account_id", "transactions", "account_id"),
+    ("idx_orders_account_id", "orders", "account_id"),
+    ("idx_holdings_account_id", "holdings", "account_id"),
+]
+
+
+def _current_defaults():
+    """Map (table, column) to its stored default, without the type cast."""
+    if context.is_offline_mode():
+        return {}
+    tables = sorted({table for table, _, _ in COLUMN_DEFAULTS})
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname, a.attname, pg_get_expr(d.adbin, d.adrelid) "
+            "FROM pg_attrdef d "
+            "JOIN pg_attribute a ON a.attrelid = d.adrelid AND a.attnum = d.adnum "
+            "JOIN pg_class c ON c.oid = d.adrelid "
+            "WHERE c.relname = ANY(:tables) AND pg_table_is_visible(c.oid)"
+        ),
+        {"tables": tables},
+    )
+    # e.g. 'USD'::character varying -> 'USD'
+    return {(table, column): expr.split("::")[0] for table, column, expr in rows}
+
+
+def _existing_constraints():
+    """Names of the constraints already present on the tables altered here."""
+    if context.is_offline_mode():
+        return set()
+    tables = sorted(
+        {table for table, *_ in FOREIGN_KEYS} | {t for t, _, _ in CHECK_CONSTRAINTS}
+    )
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT con.conname FROM pg_constraint con "
+            "JOIN pg_class c ON c.oid = con.conrelid "
+            "WHERE c.relname = ANY(:tables) AND pg_table_is_visible(c.oid)"
+        ),
+        {"tables": tables},
+    )
+    return {name for (name,) in rows}
+
+
+def _not_null_check(table, column):
+    """Name of the temporary CHECK that lets SET NOT NULL skip its scan."""
+    return f"ck_{table}_{column}_not_null"
+
+
+def _alter_tables(actions):
+    # Postgres applies every action of one ALTER TABLE under a single lock
+    # acquisition and catalog update, so each table is altered exactly once.
+    for table, table_actions in actions.items():
+        op.execute(f"ALTER TABLE {table} " + ", ".join(table_actions))
+
+
+def _not_valid_actions():
+    """ALTER TABLE actions per table that only touch the catalog."""
+    existing = _existing_constraints()
+    actions = defaultdict(list)
+    for table, old_name, new_name, column, target, on_delete in FOREIGN_KEYS:
+        actions[table].append(f"DROP CONSTRAINT IF EXISTS {old_name}")
+        if new_name not in existing:
+            actions[table].append(
+                f"ADD CONSTRAINT {new_name} FOREIGN KEY ({column}) "
+                f"REFERENCES {target} ON DELETE {on_delete} NOT VALID"
+            )
+    # SET NOT NULL would scan the table under ACCESS EXCLUSIVE; a validated
+    # CHECK (col IS NOT NULL) lets it skip that scan, so add one NOT VALID
+    # here, validate it later, and drop it once the column is NOT NULL.
+    for table, column in NOT_NULL_COLUMNS:
+        name = _not_null_check(table, column)
+        if name not in existing:
+            actions[table].append(
+                f"ADD CONSTRAINT {name} CHECK ({column} IS NOT NULL) NOT VALID"
+            )
+    # Fresh installs already have the right defaults; only rewrite the ones
+    # that differ so no-op alters do not add work to the table locks.
+    defaults = _current_defaults()
+    for table, column, default in COLUMN_DEFAULTS:
+        if defaults.get((table, column)) != default:
+            actions[table].append(f"ALTER COLUMN {column} SET DEFAULT {default}")
+    for table, name, condition in CHECK_CONSTRAINTS:
+        if name not in existing:
+            actions[table].append(
+                f"ADD CONSTRAINT {name} CHECK ({condition}) NOT VALID"
+            )
+    return actions
+
+
+def _validate_and_index():
+    """Validate the NOT VALID constraints and rebuild indexes; autocommit only."""
+    for table, _, name, _, _, _ in FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+    for table, name, _ in CHECK_CONSTRAINTS:
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+    for table, column in NOT_NULL_COLUMNS:
+        name = _not_null_check(table, column)
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+    # CONCURRENTLY cannot run inside a transaction block, but it only
+    # takes SHARE UPDATE EXCLUSIVE, so writers are not blocked while the
+    # index builds.
+    for name, table, columns in COMPOSITE_INDEXES:
+        create_index_concurrently(name, f"ON {table} ({columns})")
+
+    # Fewer indexes on the two hottest write tables means less index
+    # maintenance and WAL per inserted row.
+    for name, _, _ in REDUNDANT_INDEXES:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+    create_index_concurrently(*PENDING_ORDERS_INDEX)
+    op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_orders_status")
+
+
+def _set_not_null():
+    """SET NOT NULL on NOT_NULL_COLUMNS, then drop their validated checks."""
+    # With the checks validated, SET NOT NULL is a catalog-only change. The
+    # checks are dropped in a separate ALTER because Postgres runs DROP
+    # CONSTRAINT before SET NOT NULL within one statement, which would bring
+    # the scan back.
+    not_null = defaultdict(list)
+    helper_checks = defaultdict(list)
+    for table, column in NOT_NULL_COLUMNS:
+        not_null[table].append(f"ALTER COLUMN {column} SET NOT NULL")
+        name = _not_null_check(table, column)
+        helper_checks[table].append(f"DROP CONSTRAINT IF EXISTS {name}")
+    _alter_tables(not_null)
+    _alter_tables(helper_checks)
+
+
+def upgrade():
+    # The ALTERs below commit before the autocommit block runs. If a VALIDATE
+    # or index build there fails, alembic_version stays at 0001 and the rerun
+    # finds the renamed constraints already in place, so every step here has
+    # to be safe to repeat.
+    #
+    # Foreign keys and checks are added NOT VALID, which skips the
+    # full-table scan, so the ACCESS EXCLUSIVE lock is only held for the
+    # catalog update. Existing rows are checked afterwards by VALIDATE
+    # CONSTRAINT, which only needs SHARE UPDATE EXCLUSIVE on the child (and
+    # ROW SHARE on the parent) and lets writes continue on both.
+    _alter_tables(_not_valid_actions())
+
+    with concurrent_ddl():
+        _validate_and_index()
+
+    # Back under the migration's lock_timeout.
+    _set_not_null()
+
+
+def downgrade():
+    with concurrent_ddl():
+        create_index_concurrently("idx_orders_status", "ON orders (status)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_orders_pending")
+        for name, table, columns in REDUNDANT_INDEXES:
+            create_index_concurrently(name, f"ON {table} ({columns})")
+        for name, _, _ in reversed(COMPOSITE_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+    # Column defaults are left as corrected; the old values were never
+    # usable for inserts.
+    actions = defaultdict(list)
+    for table, name, _ in reversed(CHECK_CONSTRAINTS):
+        actions[table].append(f"DROP CONSTRAINT IF EXISTS {name}")
+    for table, column in reversed(NOT_NULL_COLUMNS):
+        actions[table].append(f"ALTER COLUMN {column} DROP NOT NULL")
+    for table, old_name, new_name, column, target, _ in reversed(FOREIGN_KEYS):
+        actions[table].append(f"DROP CONSTRAINT IF EXISTS {new_name}")
+        actions[table].append(
+            f"ADD CONSTRAINT {old_name} FOREIGN KEY ({column}) REFERENCES {target}"
+        )
+    _alter_tables(actions)
@@ -0,0 +1,47 @@
+"""audit log keyset indexes
+
+Revision ID: 0003_audit_log_keyset_indexes
+Revises: 0002_integrity_fixes
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from alembic import op
+from migration_helpers import concurrent_ddl, create_index_concurrently
+
+revision = "0003_audit_log_keyset_indexes"
+down_revision = "0002_integrity_fixes"
+branch_labels = None
+depends_on = None
+
+
+# (index name, columns) matching the ORDER BY created_at DESC, log_id DESC
+# of /admin/audit-logs, unfiltered and for each equality filter, so every
+# page is an index range scan bounded by LIMIT instead of a sort.
+KEYSET_INDEXES = [
+    ("idx_audit_log_created_log", "created_at DESC, log_id DESC"),
+    ("idx_audit_log_user_created", "user_id, created_at DESC, log_id DESC"),
+    ("idx_audit_log_action_created", "action, created_at DESC, log_id DESC"),
+]
+
+# Superseded: user_id leads idx_audit_log_user_created, and created_at
+# leads idx_audit_log_created_log, which also serves time-range scans.
+SUPERSEDED_INDEXES = [
+    ("idx_audit_log_user_id", "user_id"),
+    ("idx_audit_log_created_at", "created_at"),
+]
+
+
+def upgrade():
+    with concurrent_ddl():
+        for name, columns in KEYSET_INDEXES:
+            create_index_concurrently(name, f"ON audit_log ({columns})")
+        for name, _ in SUPERSEDED_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade():
+    with concurrent_ddl():
+        for name, columns in SUPERSEDED_INDEXES:
+            create_index_concurrently(name, f"ON audit_log ({columns})")
+        for name, _ in reversed(KEYSET_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,35 @@
+"""accounts user_id covering index
+
+Revision ID: 0004_accounts_user_covering_index
+Revises: 0003_audit_log_keyset_indexes
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from alembic import op
+from migration_helpers import concurrent_ddl, create_index_concurrently
+
+revision = "0004_accounts_user_covering_index"
+down_revision = "0003_audit_log_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+# /accounts/me reads exactly these columns by user_id; carrying them in the
+# leaf pages lets Postgres answer it with an index-only scan.
+COVERING_INDEX = (
+    "idx_accounts_user_id_covering",
+    "ON accounts (user_id) "
+    "INCLUDE (account_id, account_type, account_number, balance, currency, status)",
+)
+
+
+def upgrade():
+    with concurrent_ddl():
+        create_index_concurrently(*COVERING_INDEX)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_accounts_user_id")
+
+
+def downgrade():
+    with concurrent_ddl():
+        create_index_concurrently("idx_accounts_user_id", "ON accounts (user_id)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_accounts_user_id_covering")
@@ -0,0 +1,26 @@
+"""server-side account number default
+
+Revision ID: 0005_account_number_default
+Revises: 0004_accounts_user_covering_index
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "0005_account_number_default"
+down_revision = "0004_accounts_user_covering_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 12 hex characters, the same shape as the old uuid4().hex[:12] numbers;
+    # gen_random_bytes comes from pgcrypto, created in 0001_initial.
+    op.execute(
+        "ALTER TABLE accounts ALTER COLUMN account_number "
+        "SET DEFAULT encode(gen_random_bytes(6), 'hex')"
+    )
+
+
+def downgrade():
+    op.execute("ALTER TABLE accounts ALTER COLUMN account_number DROP DEFAULT")
@@ -0,0 +1,32 @@
+"""users keyset index
+
+Revision ID: 0006_users_keyset_index
+Revises: 0005_account_number_default
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from alembic import op
+from migration_helpers import concurrent_ddl, create_index_concurrently
+
+revision = "0006_users_keyset_index"
+down_revision = "0005_account_number_default"
+branch_labels = None
+depends_on = None
+
+
+# Matches the ORDER BY created_at DESC, user_id DESC of /admin/users, so a
+# page is an index range scan bounded by LIMIT rather than a full sort.
+KEYSET_INDEX = (
+    "idx_users_created_user",
+    "ON users (created_at DESC, user_id DESC)",
+)
+
+
+def upgrade():
+    with concurrent_ddl():
+        create_index_concurrently(*KEYSET_INDEX)
+
+
+def downgrade():
+    with concurrent_ddl():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_users_created_user")
@@ -0,0 +1,34 @@
+"""lowercase user emails
+
+Revision ID: 0007_users_email_lowercase
+Revises: 0006_users_keyset_index
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from alembic import op
+from migration_helpers import concurrent_ddl
+
+revision = "0007_users_email_lowercase"
+down_revision = "0006_users_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fails on the unique constraint if two existing accounts differ only in
+    # case; those have to be merged by hand before upgrading.
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+    # Added NOT VALID so the ACCESS EXCLUSIVE lock is held only for the catalog
+    # change; the full-table check then runs under VALIDATE CONSTRAINT, which
+    # takes SHARE UPDATE EXCLUSIVE and lets reads and writes continue.
+    op.execute("ALTER TABLE users DROP CONSTRAINT IF EXISTS ck_users_email_lowercase")
+    op.execute(
+        "ALTER TABLE users ADD CONSTRAINT ck_users_email_lowercase "
+        "CHECK (email = lower(email)) NOT VALID"
+    )
+    with concurrent_ddl():
+        op.execute("ALTER TABLE users VALIDATE CONSTRAINT ck_users_email_lowercase")
+
+
+def downgrade():
+    op.execute("ALTER TABLE users DROP CONSTRAINT IF EXISTS ck_users_email_lowercase")
@@ -0,0 +1,66 @@
+"""uuidv7 primary key defaults
+
+Revision ID: 0008_uuidv7_defaults
+Revises: 0007_users_email_lowercase
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "0008_uuidv7_defaults"
+down_revision = "0007_users_email_lowercase"
+branch_labels = None
+depends_on = None
+
+
+# Time-ordered UUIDs (RFC 9562 version 7) for the insert-heavy tables: the
+# 48-bit millisecond timestamp prefix keeps new keys on the rightmost B-tree
+# leaf instead of scattering page splits across the whole index. Built from
+# a v4 UUID by overwriting the first 6 bytes and flipping the version nibble.
+UUIDV7_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION uuidv7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(
+                        int8send(
+                            floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint
+                        )
+                        FROM 3
+                    )
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid
+$$ LANGUAGE sql VOLATILE
+"""
+
+# (table, primary key column) of the insert-heavy tables.
+UUIDV7_KEYS = [
+    ("transactions", "transaction_id"),
+    ("holdings", "holding_id"),
+    ("orders", "order_id"),
+]
+
+
+def upgrade():
+    # CREATE OR REPLACE: databases bootstrapped while 0001 still defined the
+    # function already have it. Changing a default only touches the catalog.
+    op.execute(UUIDV7_FUNCTION_SQL)
+    for table, column in UUIDV7_KEYS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT uuidv7()")
+
+
+def downgrade():
+    for table, column in UUIDV7_KEYS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            "SET DEFAULT gen_random_uuid()"
+        )
+    op.execute("DROP FUNCTION IF EXISTS uuidv7()")
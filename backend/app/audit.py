@@ -0,0 +1,105 @@
+"""
+Deferred audit writer.
+
+With AUDIT_BATCHING=1, callers that can tolerate eventual durability hand
+audit rows to ``audit_batcher.submit`` instead of inserting them in their
+own transaction. A background task collects rows for up to
+AUDIT_FLUSH_INTERVAL seconds or AUDIT_BATCH_SIZE rows, whichever comes
+first, and writes each batch with one multi-row INSERT on its own
+connection.
+
+Trade-off: a submitted row is only durable once its batch commits, so a
+crash can lose up to one flush window of rows, and a failed batch is
+logged rather than surfaced to the request. Compliance-critical actions
+(admin lock/unlock, money movement) keep writing audit rows synchronously.
+"""
+
+import asyncio
+import logging
+import os
+
+from sqlalchemy import insert
+
+from .db import engine
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+AUDIT_BATCHING = os.getenv("AUDIT_BATCHING") == "1"
+AUDIT_BATCH_SIZE = 100
+AUDIT_FLUSH_INTERVAL = 0.05
+
+# Every row carries the same keys so the batch compiles to a single
+# multi-row INSERT.
+_AUDIT_COLUMNS = (
+    "user_id",
+    "action",
+    "table_name",
+    "record_id",
+    "old_values",
+    "new_values",
+    "ip_address",
+    "user_agent",
+)
+_STOP = object()
+
+
+class AuditBatcher:
+    def __init__(
+        self,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+    ):
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: "asyncio.Queue" = asyncio.Queue()
+        self._task = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything already submitted, then stop the writer."""
+        if self._task is None:
+            return
+        self._queue.put_nowait(_STOP)
+        await self._task
+        self._task = None
+
+    def submit(self, **values) -> None:
+        self._queue.put_nowait(
+            {column: values.get(column) for column in _AUDIT_COLUMNS}
+        )
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            row = await self._queue.get()
+            if row is _STOP:
+                break
+            batch = [row]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+            await self._write(batch)
+
+    async def _write(self, rows: list) -> None:
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(insert(AuditLog), rows)
+        except Exception:
+            logger.exception("failed to write %d audit rows", len(rows))
+
+
+audit_batcher = AuditBatcher()
@@ -1,40 +1,211 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
 import os
-from datetime import datetime, timedelta
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
 
+import jwt
 from argon2 import PasswordHasher
-from jose import JWTError, jwt
 
-PWD_HASher = PasswordHasher()
+# OWASP minimum Argon2id profile (19 MiB, t=2, p=1) by default; hosts with
+# memory to spare can raise ARGON2_MEMORY_COST (KiB), e.g. 65536, or
+# ARGON2_TIME_COST. Hashes made under other parameters still verify, since
+# parameters are encoded in each hash string, and are upgraded on the next
+# successful login.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "19456"))
+PWD_HASher = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_COST,
+    parallelism=1,
+    hash_len=32,
+    salt_len=16,
+)
+# Argon2 releases the GIL, so a thread pool already hashes in parallel on all
+# cores without the pickling and fork costs of a process pool. Half the cores
+# leaves room for the event loop and bounds peak memory (one memory_cost per
+# hash in flight).
+_PW_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(
+        os.getenv("ARGON2_WORKERS", str(max(1, (os.cpu_count() or 1) // 2)))
+    ),
+    thread_name_prefix="argon2",
+)
 JWT_SECRET = os.getenv("JWT_SECRET", "please-change-me")
 JWT_ALG = "HS256"
+JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(
+    os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "15")
+)
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# The header and key schedule never change, so both are computed once;
+# each token only copies the keyed HMAC state and encodes its own payload.
+# Naming the digest keeps hmac on OpenSSL's EVP HMAC, which dispatches to
+# SHA-NI / ARMv8 SHA2 instructions when the CPU has them.
+_JWT_HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+_HMAC_PROTO = hmac.new(JWT_SECRET.encode(), digestmod="sha256")
+
+# Verification goes through PyJWT with the key prepared once, so decode is
+# handed bytes instead of re-encoding the secret per token. The algorithm
+# list is pinned to HS256, and tokens without sub or exp are rejected.
+_SIGNING_KEY = jwt.get_algorithm_by_name(JWT_ALG).prepare_key(JWT_SECRET)
+_JWT_ALGORITHMS = (JWT_ALG,)
+_JWT_DECODE_OPTIONS = {"require": ["exp", "sub"]}
+
+# Opt-in: remembering verify results skips Argon2 for repeated identical
+# credentials, at the cost of a weaker timing side-channel profile.
+AUTH_VERIFY_CACHE = os.getenv("AUTH_VERIFY_CACHE") == "1"
+_VERIFY_CACHE_SIZE = 4096
+_verify_cache: "OrderedDict[tuple[str, bytes], bool]" = OrderedDict()
+# verify_password runs on the _PW_EXECUTOR threads, so the LRU bookkeeping is
+# serialised; the Argon2 call itself stays outside the lock.
+_verify_cache_lock = threading.Lock()
+
+# SHA-256 of verified access tokens -> (subject, exp), bounded LRU. Keyed by
+# digest so live bearer tokens are never held in process memory.
+_TOKEN_CACHE_SIZE = 10_000
+_token_cache: "OrderedDict[bytes, Tuple[str, int]]" = OrderedDict()
 
 
 def hash_password(password: str) -> str:
     return PWD_HASher.hash(password)
 
 
-def verify_password(hash: str, password: str) -> bool:
+def _verify_password(hash: str, password: str) -> bool:
     try:
         return PWD_HASher.verify(hash, password)
     except Exception:
         return False
 
 
-def create_access_token(subject: str, expires_minutes: int = 15) -> str:
-    to_encode = {
-        "sub": subject,
-        "exp": datetime.utcnow() + timedelta(minutes=expires_minutes),
-    }
-    return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALG)
+def verify_password(hash: str, password: str) -> bool:
+    if not AUTH_VERIFY_CACHE:
+        return _verify_password(hash, password)
+
+    key = (hash, hashlib.blake2b(password.encode(), digest_size=16).digest())
+    with _verify_cache_lock:
+        cached = _verify_cache.get(key)
+        if cached is not None:
+            _verify_cache.move_to_end(key)
+            return cached
+
+    result = _verify_password(hash, password)
+    with _verify_cache_lock:
+        _verify_cache[key] = result
+        if len(_verify_cache) > _VERIFY_CACHE_SIZE:
+            _verify_cache.popitem(last=False)
+    return result
+
+
+async def hash_password_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_PW_EXECUTOR, hash_password, password)
+
+
+async def verify_password_async(hash: str, password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_PW_EXECUTOR, verify_password, hash, password)
 
 
-def decode_access_token(token: str) -> Optional[str]:
+async def time_password_hash(samples: int = 3) -> float:
+    """Median seconds per hash with the configured parameters on this host."""
+    loop = asyncio.get_running_loop()
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await loop.run_in_executor(_PW_EXECUTOR, hash_password, "calibration")
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[samples // 2]
+
+
+@lru_cache(maxsize=4096)
+def needs_rehash(hash: str) -> bool:
+    return PWD_HASher.check_needs_rehash(hash)
+
+
+def _encode_hs256(
+    claims: dict,
+    *,
+    _dumps=json.dumps,
+    _header=_JWT_HEADER_B64,
+    _proto=_HMAC_PROTO,
+    _b64=_b64url,
+) -> str:
+    payload = _dumps(claims, separators=(",", ":")).encode()
+    body = _header + b"." + _b64(payload)
+    mac = _proto.copy()
+    mac.update(body)
+    return (body + b"." + _b64(mac.digest())).decode()
+
+
+# The keyword-only underscore defaults below are bound once at definition
+# time, so the per-token path reads locals (LOAD_FAST) instead of module
+# globals. They are not part of the public signature; do not pass them.
+def create_access_token(
+    subject: str,
+    expires_minutes: int = JWT_ACCESS_TOKEN_EXPIRE_MINUTES,
+    *,
+    _time=time.time,
+    _encode=_encode_hs256,
+) -> str:
+    # Tokens only carry sub/exp, so they are signed directly; any token with
+    # custom claims should go through jwt.encode instead.
+    exp = int(_time()) + expires_minutes * 60
+    return _encode({"sub": subject, "exp": exp})
+
+
+def _decode_claims(
+    token: str,
+    *,
+    _decode=jwt.decode,
+    _key=_SIGNING_KEY,
+    _algorithms=_JWT_ALGORITHMS,
+    _options=_JWT_DECODE_OPTIONS,
+    _error=jwt.PyJWTError,
+) -> Optional[Tuple[str, int]]:
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG])
-        return payload.get("sub")
-    except JWTError:
+        payload = _decode(token, _key, algorithms=_algorithms, options=_options)
+    except _error:
+        return None
+    subject = payload["sub"]
+    if not isinstance(subject, str):
+        return None
+    return subject, payload["exp"]
+
+
+def decode_access_token(
+    token: str, *, _time=time.time, _cache=_token_cache, _sha256=hashlib.sha256
+) -> Optional[str]:
+    # A token's claims never change, so once its signature has been checked
+    # only the expiry needs re-checking on later requests.
+    key = _sha256(token.encode()).digest()
+    cached = _cache.get(key)
+    if cached is not None:
+        subject, exp = cached
+        if exp > _time():
+            _cache.move_to_end(key)
+            return subject
+        del _cache[key]
+        return None
+
+    claims = _decode_claims(token)
+    if claims is None:
         return None
+    _cache[key] = claims
+    if len(_cache) > _TOKEN_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return claims[0]
 
 
 # NOTE: Implement rotating refresh tokens and revocation lists in production.
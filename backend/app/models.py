@@ -1,21 +1,47 @@
 from sqlalchemy import (
+    BigInteger,
     Boolean,
+    CheckConstraint,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Numeric,
     String,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import INET, JSONB, UUID
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+import os
+import time
 import uuid
 
 from .db import Base
 
 
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7): 48-bit ms timestamp + random.
+
+    Keys on append-heavy tables then land on the right-most B-tree pages
+    instead of random ones, the same layout as the uuidv7() SQL default.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Emails are normalized on write (0007_users_email_lowercase), so the
+        # unique index on email also enforces case-insensitive uniqueness.
+        CheckConstraint("email = lower(email)", name="ck_users_email_lowercase"),
+        # Keyset pagination for /admin/users (0006_users_keyset_index).
+        Index("idx_users_created_user", text("created_at DESC"), text("user_id DESC")),
+    )
 
     user_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, nullable=False)
@@ -28,30 +54,63 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # lazy="raise": an implicit per-row load (N+1) fails loudly; handlers that
+    # need related rows opt in with .options(selectinload(...)). Deletes rely
+    # on the ON DELETE CASCADE foreign keys instead of loading children.
+    accounts = relationship("Account", lazy="raise", passive_deletes=True)
+
 
 class Account(Base):
     __tablename__ = "accounts"
+    __table_args__ = (
+        CheckConstraint("balance >= 0", name="ck_accounts_balance_non_negative"),
+        # Covers the /accounts/me projection (0004_accounts_user_covering_index).
+        Index(
+            "idx_accounts_user_id_covering",
+            "user_id",
+            postgresql_include=[
+                "account_id",
+                "account_type",
+                "account_number",
+                "balance",
+                "currency",
+                "status",
+            ],
+        ),
+    )
 
     account_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"))
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        nullable=False,
+    )
     account_type = Column(String(50), nullable=False)
-    account_number = Column(String(50), unique=True, nullable=False)
+    account_number = Column(
+        String(50),
+        unique=True,
+        nullable=False,
+        server_default=text("encode(gen_random_bytes(6), 'hex')"),
+    )
     balance = Column(Numeric(18, 2), server_default="0.00")
     currency = Column(String(3), server_default="USD")
     status = Column(String(20), server_default="active")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    holdings = relationship("Holding", lazy="raise", passive_deletes=True)
+
 
 class Transaction(Base):
     __tablename__ = "transactions"
-
-    transaction_id = Column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    __table_args__ = (
+        CheckConstraint("amount > 0", name="ck_transactions_amount_positive"),
     )
+
+    transaction_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     account_id = Column(
         UUID(as_uuid=True),
-        ForeignKey("accounts.account_id"),
+        ForeignKey("accounts.account_id", ondelete="CASCADE"),
         nullable=False,
     )
     transaction_type = Column(String(20), nullable=False)
@@ -79,11 +138,14 @@ class Security(Base):
 
 class Holding(Base):
     __tablename__ = "holdings"
+    __table_args__ = (
+        CheckConstraint("quantity > 0", name="ck_holdings_quantity_positive"),
+    )
 
-    holding_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    holding_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     account_id = Column(
         UUID(as_uuid=True),
-        ForeignKey("accounts.account_id"),
+        ForeignKey("accounts.account_id", ondelete="CASCADE"),
         nullable=False,
     )
     security_id = Column(
@@ -99,11 +161,14 @@ class Holding(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        CheckConstraint("quantity > 0", name="ck_orders_quantity_positive"),
+    )
 
-    order_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    order_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     account_id = Column(
         UUID(as_uuid=True),
-        ForeignKey("accounts.account_id"),
+        ForeignKey("accounts.account_id", ondelete="CASCADE"),
         nullable=False,
     )
     security_id = Column(
@@ -125,13 +190,32 @@ class Order(Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_log"
-
-    log_id = Column(
-        Numeric(asdecimal=False), primary_key=True, autoincrement=True
+    # Keyset pagination indexes for /admin/audit-logs
+    # (0003_audit_log_keyset_indexes).
+    __table_args__ = (
+        Index(
+            "idx_audit_log_created_log",
+            text("created_at DESC"),
+            text("log_id DESC"),
+        ),
+        Index(
+            "idx_audit_log_user_created",
+            "user_id",
+            text("created_at DESC"),
+            text("log_id DESC"),
+        ),
+        Index(
+            "idx_audit_log_action_created",
+            "action",
+            text("created_at DESC"),
+            text("log_id DESC"),
+        ),
     )
+
+    log_id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(
         UUID(as_uuid=True),
-        ForeignKey("users.user_id"),
+        ForeignKey("users.user_id", ondelete="SET NULL"),
     )
     action = Column(String(100), nullable=False)
     table_name = Column(String(100))
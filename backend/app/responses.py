@@ -0,0 +1,25 @@
+from fastapi.responses import ORJSONResponse, StreamingResponse
+
+# Encoded once; appended to the raw header list of every default response so
+# no middleware frame or per-response header-dict work is needed.
+_SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"referrer-policy", b"no-referrer"),
+    (b"content-security-policy", b"default-src 'none'; frame-ancestors 'none'"),
+    (b"strict-transport-security", b"max-age=63072000; includeSubDomains"),
+]
+
+
+class SecureORJSONResponse(ORJSONResponse):
+    def init_headers(self, headers=None):
+        super().init_headers(headers)
+        self.raw_headers.extend(_SECURITY_HEADERS)
+
+
+class SecureStreamingResponse(StreamingResponse):
+    # Streamed bodies bypass default_response_class, so they carry the same
+    # headers explicitly.
+    def init_headers(self, headers=None):
+        super().init_headers(headers)
+        self.raw_headers.extend(_SECURITY_HEADERS)
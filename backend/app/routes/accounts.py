@@ -1,7 +1,13 @@
-from uuid import uuid4
-
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy import select
+from sqlalchemy import (
+    String,
+    bindparam,
+    cast,
+    func,
+    insert,
+    literal_column,
+    select,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..db import get_db
@@ -12,6 +18,33 @@ from .auth_routes import get_current_user
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
+# Built once at import; handlers only bind parameters.
+_INSERT_ACCOUNT = insert(Account).returning(*Account.__table__.c)
+_AUDIT_ACCOUNT_CREATE = insert(AuditLog).values(
+    user_id=bindparam("owner_id"),
+    action="account_create",
+    table_name="accounts",
+    record_id=bindparam("new_account_id"),
+    new_values=func.jsonb_build_object(
+        literal_column("'account_type'"),
+        cast(bindparam("new_account_type"), String),
+        literal_column("'currency'"),
+        cast(bindparam("new_currency"), String),
+    ),
+    ip_address=bindparam("client_ip"),
+    user_agent=bindparam("client_user_agent"),
+)
+# Only the AccountOut columns, all carried by idx_accounts_user_id_covering,
+# so the lookup can be served by an index-only scan.
+_SELECT_MY_ACCOUNTS = select(
+    Account.account_id,
+    Account.account_type,
+    Account.account_number,
+    Account.balance,
+    Account.currency,
+    Account.status,
+).where(Account.user_id == bindparam("owner_id"))
+
 
 @router.post("", response_model=AccountOut, status_code=status.HTTP_201_CREATED)
 async def create_account(
@@ -20,34 +53,31 @@ async def create_account(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    # Very simple account number generation; rely on DB uniqueness constraint
-    account_number = uuid4().hex[:12]
-
-    account = Account(
-        user_id=current_user.user_id,
-        account_type=payload.account_type,
-        account_number=account_number,
-        currency=payload.currency,
+    # The account number is generated by the column default (random 12 hex
+    # chars, uniqueness enforced by the DB); RETURNING hands it back with the
+    # other server defaults, so no follow-up refresh SELECT is needed.
+    result = await db.execute(
+        _INSERT_ACCOUNT,
+        {
+            "user_id": current_user.user_id,
+            "account_type": payload.account_type,
+            "currency": payload.currency,
+        },
     )
+    account = result.one()
 
-    audit = AuditLog(
-        user_id=current_user.user_id,
-        action="account_create",
-        table_name="accounts",
-        record_id=account.account_id,
-        old_values=None,
-        new_values={
-            "account_type": account.account_type,
-            "currency": account.currency,
+    await db.execute(
+        _AUDIT_ACCOUNT_CREATE,
+        {
+            "owner_id": current_user.user_id,
+            "new_account_id": account.account_id,
+            "new_account_type": account.account_type,
+            "new_currency": account.currency,
+            "client_ip": request.client.host if request.client else None,
+            "client_user_agent": request.headers.get("user-agent"),
         },
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
     )
-
-    db.add(account)
-    db.add(audit)
     await db.commit()
-    await db.refresh(account)
     return account
 
 
@@ -56,9 +86,7 @@ async def list_my_accounts(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    result = await db.execute(
-        select(Account).where(Account.user_id == current_user.user_id)
-    )
-    accounts = result.scalars().all()
+    result = await db.execute(_SELECT_MY_ACCOUNTS, {"owner_id": current_user.user_id})
+    accounts = result.all()
     return accounts
 
@@ -1,26 +1,212 @@
+import base64
+from datetime import datetime
+from functools import partial
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import and_, select
+import orjson
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
+from sqlalchemy import (
+    String,
+    Text,
+    and_,
+    bindparam,
+    cast,
+    func,
+    insert,
+    lambda_stmt,
+    literal_column,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import INET, UUID as UUID_TYPE
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..db import get_db
 from ..models import Account, AuditLog, User
+from ..responses import SecureORJSONResponse, SecureStreamingResponse
 from ..schemas import AuditLogOut, AccountOut, UserOut
-from .auth_routes import get_current_admin
+from .auth_routes import (
+    get_current_admin,
+    invalidate_admin_cache,
+    invalidate_user_cache,
+)
 
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
+def _jsonb_pair(key: str, value):
+    # Built server-side from a column of the statement itself, so no dict is
+    # allocated and JSON-encoded per request.
+    return func.jsonb_build_object(literal_column(f"'{key}'"), value)
+
+
+def _toggle_statement(model, key_column, value_column):
+    # One statement, one round trip: the locked pre-image in "prev" supplies
+    # the audit old_values, "changed" applies the update, and "audit" writes
+    # the audit row from the updated row. It inserts nothing when the target
+    # does not exist. Request-derived values are cast because Postgres cannot
+    # infer parameter types in a SELECT list. Built on the Core tables: the
+    # ORM compile path drops the independent "audit" CTE.
+    table = model.__table__
+    key, value = key_column.key, value_column.key
+    prev = (
+        select(table.c[key], table.c[value])
+        .where(table.c[key] == bindparam("target_id"))
+        .with_for_update()
+        .cte("prev")
+    )
+    changed = (
+        update(table)
+        .where(table.c[key] == prev.c[key])
+        .values({value: bindparam("new_value")})
+        .returning(*table.c, prev.c[value].label("prev_value"))
+        .cte("changed")
+    )
+    audit = insert(AuditLog.__table__).from_select(
+        [
+            "user_id",
+            "action",
+            "table_name",
+            "record_id",
+            "old_values",
+            "new_values",
+            "ip_address",
+            "user_agent",
+        ],
+        select(
+            cast(bindparam("admin_id"), UUID_TYPE),
+            cast(bindparam("audit_action"), String),
+            literal_column(f"'{table.name}'"),
+            changed.c[key],
+            _jsonb_pair(value, changed.c.prev_value),
+            _jsonb_pair(value, changed.c[value]),
+            cast(bindparam("client_ip"), INET),
+            cast(bindparam("client_user_agent"), Text),
+        ),
+    )
+    return select(changed).add_cte(audit.cte("audit"))
+
+
+# Built once at import; handlers only bind parameters, so SQLAlchemy's
+# statement construction and cache-key generation stay off the request path.
+_USER_OUT_COLUMNS = (
+    User.user_id,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.phone,
+    User.kyc_status,
+    User.is_active,
+)
+_USERS_ORDER = (User.created_at.desc(), User.user_id.desc())
+_LIST_USERS = select(*_USER_OUT_COLUMNS).order_by(*_USERS_ORDER)
+_STREAM_BATCH_SIZE = 200
+_SET_USER_ACTIVE = _toggle_statement(User, User.user_id, User.is_active)
+_SET_ACCOUNT_STATUS = _toggle_statement(Account, Account.account_id, Account.status)
+
+
 @router.get("/users", response_model=list[UserOut])
 async def list_users(
+    cursor: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
     db: AsyncSession = Depends(get_db),
     admin=Depends(get_current_admin),
 ):
-    result = await db.execute(select(User).order_by(User.created_at.desc()))
-    return result.scalars().all()
+    if cursor is not None or limit is not None:
+        return await _users_page(db, cursor, limit or 100)
+    # The user list is unbounded, so rather than hydrating every row and
+    # serializing one large list, rows are read from a server-side cursor in
+    # batches and written out as they arrive. That keeps a pooled connection
+    # checked out until the client has read the whole body; clients that can
+    # page should pass limit instead.
+    return SecureStreamingResponse(_stream_users(db), media_type="application/json")
+
+
+async def _users_page(db: AsyncSession, cursor: Optional[str], limit: int):
+    # Same keyset scheme as /admin/audit-logs, walking
+    # idx_users_created_user; user_id breaks created_at ties.
+    query = lambda_stmt(
+        lambda: select(*_USER_OUT_COLUMNS, User.created_at)
+        .order_by(*_USERS_ORDER)
+        .limit(limit)
+    )
+    if cursor is not None:
+        created_at, last_id = _decode_cursor(cursor, UUID)
+        query += lambda s: s.where(
+            tuple_(User.created_at, User.user_id) < tuple_(created_at, last_id)
+        )
+
+    result = await db.execute(query)
+    users = [dict(row) for row in result.mappings()]
+
+    response = SecureORJSONResponse(users)
+    if len(users) == limit:
+        response.headers["X-Next-Cursor"] = _encode_cursor(
+            users[-1]["created_at"], users[-1]["user_id"]
+        )
+    for user in users:
+        del user["created_at"]
+    return response
+
+
+async def _stream_users(db: AsyncSession):
+    result = await db.stream(_LIST_USERS)
+    separator = b"["
+    async for batch in result.mappings().partitions(_STREAM_BATCH_SIZE):
+        yield separator + b",".join(orjson.dumps(dict(row)) for row in batch)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+def _audit_params(action: str, request: Request, admin: User) -> dict:
+    return {
+        "admin_id": admin.user_id,
+        "audit_action": action,
+        "client_ip": request.client.host if request.client else None,
+        "client_user_agent": request.headers.get("user-agent"),
+    }
+
+
+async def _toggle(
+    statement,
+    not_found_detail: str,
+    target_id: UUID,
+    new_value,
+    action: str,
+    request: Request,
+    db: AsyncSession,
+    admin: User,
+):
+    params = {"target_id": target_id, "new_value": new_value}
+    # Everything the audit row needs from the request is gathered before the
+    # statement takes its row lock, so the lock spans only it and the commit.
+    params.update(_audit_params(action, request, admin))
+
+    result = await db.execute(statement, params)
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=not_found_detail,
+        )
+
+    await db.commit()
+    return row
+
+
+# The user and account toggles differ only in their prebuilt statements.
+_toggle_user_status = partial(_toggle, _SET_USER_ACTIVE, "user not found")
+_toggle_account_status = partial(_toggle, _SET_ACCOUNT_STATUS, "account not found")
 
 
 @router.post("/users/{user_id}/lock", response_model=UserOut)
@@ -30,30 +216,9 @@ async def lock_user(
     db: AsyncSession = Depends(get_db),
     admin=Depends(get_current_admin),
 ):
-    result = await db.execute(select(User).where(User.user_id == user_id).with_for_update())
-    target = result.scalar_one_or_none()
-    if target is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
-
-    old_values = {"is_active": target.is_active}
-    target.is_active = False
-
-    audit = AuditLog(
-        user_id=admin.user_id,
-        action="user_lock",
-        table_name="users",
-        record_id=target.user_id,
-        old_values=old_values,
-        new_values={"is_active": target.is_active},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-    )
-
-    async with db.begin():
-        db.add(target)
-        db.add(audit)
-
-    await db.refresh(target)
+    target = await _toggle_user_status(user_id, False, "user_lock", request, db, admin)
+    invalidate_user_cache(user_id)
+    invalidate_admin_cache()
     return target
 
 
@@ -64,31 +229,7 @@ async def unlock_user(
     db: AsyncSession = Depends(get_db),
     admin=Depends(get_current_admin),
 ):
-    result = await db.execute(select(User).where(User.user_id == user_id).with_for_update())
-    target = result.scalar_one_or_none()
-    if target is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
-
-    old_values = {"is_active": target.is_active}
-    target.is_active = True
-
-    audit = AuditLog(
-        user_id=admin.user_id,
-        action="user_unlock",
-        table_name="users",
-        record_id=target.user_id,
-        old_values=old_values,
-        new_values={"is_active": target.is_active},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-    )
-
-    async with db.begin():
-        db.add(target)
-        db.add(audit)
-
-    await db.refresh(target)
-    return target
+    return await _toggle_user_status(user_id, True, "user_unlock", request, db, admin)
 
 
 @router.post("/accounts/{account_id}/lock", response_model=AccountOut)
@@ -98,34 +239,10 @@ async def lock_account(
     db: AsyncSession = Depends(get_db),
     admin=Depends(get_current_admin),
 ):
-    result = await db.execute(
-        select(Account).where(Account.account_id == account_id).with_for_update()
-    )
-    account = result.scalar_one_or_none()
-    if account is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="account not found")
-
-    old_values = {"status": account.status}
-    account.status = "locked"
-
-    audit = AuditLog(
-        user_id=admin.user_id,
-        action="account_lock",
-        table_name="accounts",
-        record_id=account.account_id,
-        old_values=old_values,
-        new_values={"status": account.status},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
+    return await _toggle_account_status(
+        account_id, "locked", "account_lock", request, db, admin
     )
 
-    async with db.begin():
-        db.add(account)
-        db.add(audit)
-
-    await db.refresh(account)
-    return account
-
 
 @router.post("/accounts/{account_id}/unlock", response_model=AccountOut)
 async def unlock_account(
@@ -134,50 +251,84 @@ async def unlock_account(
     db: AsyncSession = Depends(get_db),
     admin=Depends(get_current_admin),
 ):
-    result = await db.execute(
-        select(Account).where(Account.account_id == account_id).with_for_update()
-    )
-    account = result.scalar_one_or_none()
-    if account is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="account not found")
-
-    old_values = {"status": account.status}
-    account.status = "active"
-
-    audit = AuditLog(
-        user_id=admin.user_id,
-        action="account_unlock",
-        table_name="accounts",
-        record_id=account.account_id,
-        old_values=old_values,
-        new_values={"status": account.status},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
+    return await _toggle_account_status(
+        account_id, "active", "account_unlock", request, db, admin
     )
 
-    async with db.begin():
-        db.add(account)
-        db.add(audit)
 
-    await db.refresh(account)
-    return account
+def _encode_cursor(created_at: datetime, tiebreak) -> str:
+    raw = f"{created_at.isoformat()}|{tiebreak}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str, tiebreak_type=int) -> tuple[datetime, object]:
+    try:
+        created_at, tiebreak = base64.urlsafe_b64decode(cursor).decode().split("|")
+        return datetime.fromisoformat(created_at), tiebreak_type(tiebreak)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="invalid cursor",
+        )
+
+
+# INET is read back as host() text: asyncpg decodes inet to ipaddress objects,
+# which neither AuditLogOut's str field nor orjson accept.
+_AUDIT_LOG_COLUMNS = (
+    AuditLog.log_id,
+    AuditLog.user_id,
+    AuditLog.action,
+    AuditLog.table_name,
+    AuditLog.record_id,
+    AuditLog.old_values,
+    AuditLog.new_values,
+    func.host(AuditLog.ip_address).label("ip_address"),
+    AuditLog.user_agent,
+    AuditLog.created_at,
+)
 
 
 @router.get("/audit-logs", response_model=list[AuditLogOut])
 async def list_audit_logs(
     user_id: Optional[UUID] = Query(default=None),
     action: Optional[str] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
     limit: int = Query(default=100, ge=1, le=1000),
     db: AsyncSession = Depends(get_db),
     admin=Depends(get_current_admin),
 ):
-    query = select(AuditLog).order_by(AuditLog.created_at.desc()).limit(limit)
+    # Keyset pagination: each page is a range scan on one of the
+    # (..., created_at DESC, log_id DESC) indexes, bounded by LIMIT, no matter
+    # how deep the caller pages. log_id breaks ties between equal timestamps.
+    # lambda_stmt caches the built statement per filter shape; the closure
+    # variables become bound parameters.
+    query = lambda_stmt(
+        lambda: select(*_AUDIT_LOG_COLUMNS)
+        .order_by(AuditLog.created_at.desc(), AuditLog.log_id.desc())
+        .limit(limit)
+    )
 
     if user_id is not None:
-        query = query.where(AuditLog.user_id == user_id)
+        query += lambda s: s.where(AuditLog.user_id == user_id)
     if action is not None:
-        query = query.where(AuditLog.action == action)
+        query += lambda s: s.where(AuditLog.action == action)
+    if cursor is not None:
+        created_at, log_id = _decode_cursor(cursor)
+        query += lambda s: s.where(
+            tuple_(AuditLog.created_at, AuditLog.log_id) < tuple_(created_at, log_id)
+        )
 
     result = await db.execute(query)
-    return result.scalars().all()
-
+    logs = [dict(row) for row in result.mappings()]
+
+    # Rows already have the AuditLogOut shape, and orjson encodes UUIDs,
+    # datetimes and the JSONB dicts natively, so the response is built
+    # directly instead of going through response_model validation and
+    # jsonable_encoder.
+    response = SecureORJSONResponse(logs)
+    if len(logs) == limit:
+        last = logs[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(
+            last["created_at"], last["log_id"]
+        )
+    return response
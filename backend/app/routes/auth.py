@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from pydantic import BaseModel, EmailStr
+from sqlalchemy.exc import IntegrityError
+from pydantic import BaseModel, EmailStr, validator
 
 from ..db import get_db
 from ..models import User
 from ..auth import hash_password, verify_password, create_access_token
+from ..schemas import normalize_email
 
 router = APIRouter()
 
@@ -16,11 +18,15 @@ class RegisterIn(BaseModel):
     first_name: str = ""
     last_name: str = ""
 
+    _normalize_email = validator("email", allow_reuse=True)(normalize_email)
+
 
 class LoginIn(BaseModel):
     email: EmailStr
     password: str
 
+    _normalize_email = validator("email", allow_reuse=True)(normalize_email)
+
 
 class AuthOut(BaseModel):
     access_token: str
@@ -33,18 +39,20 @@ class AuthOut(BaseModel):
 
 @router.post("/register", response_model=AuthOut, status_code=status.HTTP_201_CREATED)
 async def register(payload: RegisterIn, db: AsyncSession = Depends(get_db)):
-    async with db.begin():
-        existing = await db.execute(select(User).where(User.email == payload.email))
-        if existing.scalar_one_or_none():
-            raise HTTPException(status_code=409, detail="Email already registered")
-        user = User(
-            email=payload.email,
-            password_hash=hash_password(payload.password),
-            first_name=payload.first_name,
-            last_name=payload.last_name,
-        )
-        db.add(user)
-    await db.refresh(user)
+    user = User(
+        email=payload.email,
+        password_hash=hash_password(payload.password),
+        first_name=payload.first_name,
+        last_name=payload.last_name,
+    )
+    # The unique index on users.email detects duplicates on insert.
+    try:
+        async with db.begin():
+            db.add(user)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Email already registered")
+    # expire_on_commit=False keeps the attributes loaded, and user_id is a
+    # client-side default, so no refresh SELECT is needed.
     token = create_access_token(str(user.user_id))
     return AuthOut(access_token=token, user_id=str(user.user_id),
                    email=user.email, first_name=user.first_name or "",
@@ -1,14 +1,33 @@
 import os
+import time
+from collections import OrderedDict
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import (
+    String,
+    bindparam,
+    cast,
+    func,
+    insert,
+    literal_column,
+    select,
+)
+from sqlalchemy.exc import IntegrityError
 from uuid import UUID
 
-from ..auth import hash_password, verify_password, create_access_token, decode_access_token
+from ..auth import (
+    create_access_token,
+    decode_access_token,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
+from ..audit import AUDIT_BATCHING, audit_batcher
 from ..db import get_db
 from ..models import AuditLog, User
+from ..responses import SecureORJSONResponse
 from ..schemas import UserCreate, UserOut, UserLogin, TokenResponse
 
 
@@ -16,11 +35,33 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Built once at import; handlers only bind parameters, so SQLAlchemy's
+# statement construction and cache-key generation stay off the request path.
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_INSERT_USER = insert(User).returning(*User.__table__.c)
+_USER_OUT_FIELDS = tuple(UserOut.__fields__)
+_AUDIT_USER_REGISTER = insert(AuditLog).values(
+    user_id=bindparam("new_user_id"),
+    action="user_register",
+    table_name="users",
+    record_id=bindparam("new_user_id"),
+    new_values=func.jsonb_build_object(
+        literal_column("'email'"), cast(bindparam("new_email"), String)
+    ),
+    ip_address=bindparam("client_ip"),
+    user_agent=bindparam("client_user_agent"),
+)
+
+
+# Read once at import; changing ADMIN_EMAILS requires a restart.
+_ADMIN_EMAILS = frozenset(
+    e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()
+)
+
 
 def _is_admin(user: User) -> bool:
-    raw = os.getenv("ADMIN_EMAILS", "")
-    emails = {e.strip().lower() for e in raw.split(",") if e.strip()}
-    return user.email.lower() in emails
+    # Stored emails are lowercase (ck_users_email_lowercase).
+    return user.email in _ADMIN_EMAILS
 
 
 @router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
@@ -29,37 +70,40 @@ async def register_user(
     request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    existing = await db.execute(select(User).where(User.email == payload.email))
-    if existing.scalar_one_or_none():
+    params = {
+        "email": payload.email,
+        "password_hash": await hash_password_async(payload.password),
+        "first_name": payload.first_name,
+        "last_name": payload.last_name,
+        "phone": payload.phone,
+    }
+    # No existence pre-check: the unique index on users.email rejects a
+    # duplicate in the same round trip as the insert. RETURNING hands back
+    # the server defaults, so no follow-up refresh SELECT is needed.
+    try:
+        result = await db.execute(_INSERT_USER, params)
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="user with this email already exists",
         )
+    user = result.one()
 
-    user = User(
-        email=payload.email,
-        password_hash=hash_password(payload.password),
-        first_name=payload.first_name,
-        last_name=payload.last_name,
-        phone=payload.phone,
+    await db.execute(
+        _AUDIT_USER_REGISTER,
+        {
+            "new_user_id": user.user_id,
+            "new_email": user.email,
+            "client_ip": request.client.host if request.client else None,
+            "client_user_agent": request.headers.get("user-agent"),
+        },
     )
-
-    audit = AuditLog(
-        user_id=user.user_id,
-        action="user_register",
-        table_name="users",
-        record_id=user.user_id,
-        old_values=None,
-        new_values={"email": user.email},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-    )
-
-    db.add(user)
-    db.add(audit)
     await db.commit()
-    await db.refresh(user)
-    return user
+    return SecureORJSONResponse(
+        {name: getattr(user, name) for name in _USER_OUT_FIELDS},
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -68,7 +112,7 @@ async def login(
     request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(User).where(User.email == payload.email))
+    result = await db.execute(_USER_BY_EMAIL, {"email": payload.email})
     user = result.scalar_one_or_none()
     if not user or not user.is_active:
         raise HTTPException(
@@ -76,15 +120,21 @@ async def login(
             detail="invalid credentials",
         )
 
-    if not verify_password(user.password_hash, payload.password):
+    if not await verify_password_async(user.password_hash, payload.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="invalid credentials",
         )
 
+    # Upgrade hashes made under older Argon2 parameters while the plaintext
+    # is at hand; committed together with the audit row below.
+    rehashed = needs_rehash(user.password_hash)
+    if rehashed:
+        user.password_hash = await hash_password_async(payload.password)
+
     token = create_access_token(str(user.user_id))
 
-    audit = AuditLog(
+    audit_values = dict(
         user_id=user.user_id,
         action="login_success",
         table_name="users",
@@ -94,18 +144,54 @@ async def login(
         ip_address=request.client.host if request.client else None,
         user_agent=request.headers.get("user-agent"),
     )
-    db.add(audit)
-    await db.commit()
+    # A login record is not worth a commit on the request path when
+    # batching is enabled; see app/audit.py for the durability trade-off.
+    if AUDIT_BATCHING:
+        audit_batcher.submit(**audit_values)
+        if rehashed:
+            await db.commit()
+    else:
+        db.add(AuditLog(**audit_values))
+        await db.commit()
 
-    return TokenResponse(
-        access_token=token,
-        user_id=user.user_id,
-        email=user.email,
-        first_name=user.first_name,
-        last_name=user.last_name,
+    # Already in TokenResponse's shape with orjson-native values, so the
+    # body is encoded directly rather than through response_model
+    # validation and jsonable_encoder.
+    return SecureORJSONResponse(
+        {
+            "access_token": token,
+            "token_type": "bearer",
+            "user_id": user.user_id,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+        }
     )
 
 
+def _detached(db: AsyncSession, user: User) -> User:
+    # Cached users outlive the request that loaded them. Left attached, a
+    # rollback in that request would expire the instance, and every later
+    # cache hit would raise DetachedInstanceError on attribute access.
+    if user in db:
+        db.expunge(user)
+    return user
+
+
+# Active users by id -> (user, expires_at), so authenticated requests skip the
+# users SELECT once the token has been seen. Entries are detached instances
+# with their columns loaded, which is all the routes need since they only
+# read columns. Locking a user evicts its entry in this process;
+# other workers serve it for at most the TTL (see docs/API.md, 8.2).
+USER_CACHE_TTL_SECONDS = 5
+_USER_CACHE_SIZE = 5000
+_user_cache: "OrderedDict[UUID, tuple[User, float]]" = OrderedDict()
+
+
+def invalidate_user_cache(user_id: UUID) -> None:
+    _user_cache.pop(user_id, None)
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
@@ -125,21 +211,66 @@ async def get_current_user(
             detail="invalid token subject",
         )
 
-    result = await db.execute(select(User).where(User.user_id == user_id))
-    user = result.scalar_one_or_none()
+    cached = _user_cache.get(user_id)
+    if cached is not None and cached[1] > time.monotonic():
+        _user_cache.move_to_end(user_id)
+        return cached[0]
+
+    # Primary-key load: answered from the session's identity map when the
+    # user is already loaded in this request.
+    user = await db.get(User, user_id)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="user not found or inactive",
         )
+
+    _user_cache[user_id] = (
+        _detached(db, user),
+        time.monotonic() + USER_CACHE_TTL_SECONDS,
+    )
+    _user_cache.move_to_end(user_id)
+    if len(_user_cache) > _USER_CACHE_SIZE:
+        _user_cache.popitem(last=False)
     return user
 
 
-async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+# Resolved admins by token subject -> (user, expires_at). Lets a burst of admin
+# requests skip the per-request user SELECT. Process-local: locking a user
+# clears it only in the worker that served the lock, so with more than one
+# worker (WEB_CONCURRENCY, which uvicorn reads) it is skipped and admins are
+# only subject to the user cache TTL above (see docs/API.md, 8.2).
+ADMIN_CACHE_TTL_SECONDS = 5
+ADMIN_CACHE_ENABLED = int(os.getenv("WEB_CONCURRENCY", "1")) <= 1
+_ADMIN_CACHE_SIZE = 1024
+_admin_cache: "OrderedDict[str, tuple[User, float]]" = OrderedDict()
+
+
+def invalidate_admin_cache() -> None:
+    _admin_cache.clear()
+
+
+async def get_current_admin(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    subject = decode_access_token(token) if ADMIN_CACHE_ENABLED else None
+    cached = _admin_cache.get(subject) if subject is not None else None
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+
+    current_user = await get_current_user(token, db)
     if not _is_admin(current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="admin privileges required",
         )
-    return current_user
 
+    if subject is not None:
+        _admin_cache[subject] = (
+            _detached(db, current_user),
+            time.monotonic() + ADMIN_CACHE_TTL_SECONDS,
+        )
+        if len(_admin_cache) > _ADMIN_CACHE_SIZE:
+            _admin_cache.popitem(last=False)
+    return current_user
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from pydantic import BaseModel
 from typing import Optional, List
 from uuid import UUID
@@ -10,8 +10,11 @@ from ..db import get_db
 from ..models import Holding, Account
 from ..dependencies import get_current_user
 
+# Not included by app/main.py; positions are served by /portfolio instead.
 router = APIRouter()
 
+_NIL_UUID = UUID(int=0)
+
 
 class HoldingOut(BaseModel):
     holding_id: UUID
@@ -25,17 +28,57 @@ class HoldingOut(BaseModel):
         orm_mode = True
 
 
-async def _assert_account_owner(account_id: UUID, user_id: str, db: AsyncSession):
-    result = await db.execute(
-        select(Account).where(Account.account_id == account_id, Account.user_id == user_id)
+# Built once at import; the join applies the ownership check in the same
+# round trip as the holdings read. It reaches holdings through the
+# uq_holdings_account_security index, whose leading column is account_id.
+_OWNED_HOLDINGS = (
+    select(
+        Holding.holding_id,
+        Holding.account_id,
+        Holding.security_id,
+        Holding.quantity,
+        Holding.average_cost,
+        Holding.current_price,
     )
-    if not result.scalar_one_or_none():
-        raise HTTPException(status_code=403, detail="Account not found or access denied")
+    .join(Account, Account.account_id == Holding.account_id)
+    .where(
+        Holding.account_id == bindparam("account_id"),
+        Account.user_id == bindparam("owner_id"),
+    )
+    .order_by(Holding.holding_id)
+)
+# Keyset page: holding_id is unique, so the cursor resumes exactly after the
+# last row returned, without OFFSET's walk over the skipped rows.
+_OWNED_HOLDINGS_PAGE = (
+    _OWNED_HOLDINGS.where(Holding.holding_id > bindparam("after"))
+    .limit(bindparam("limit"))
+)
+_OWNS_ACCOUNT = select(Account.account_id).where(
+    Account.account_id == bindparam("account_id"),
+    Account.user_id == bindparam("owner_id"),
+)
 
 
 @router.get("/", response_model=List[HoldingOut])
-async def list_holdings(account_id: UUID, db: AsyncSession = Depends(get_db),
+async def list_holdings(account_id: UUID,
+                        response: Response,
+                        cursor: Optional[UUID] = Query(default=None),
+                        limit: Optional[int] = Query(default=None, ge=1, le=1000),
+                        db: AsyncSession = Depends(get_db),
                         current_user: str = Depends(get_current_user)):
-    await _assert_account_owner(account_id, current_user, db)
-    result = await db.execute(select(Holding).where(Holding.account_id == account_id))
-    return result.scalars().all()
+    params = {"account_id": account_id, "owner_id": current_user}
+    if cursor is None and limit is None:
+        rows = (await db.execute(_OWNED_HOLDINGS, params)).all()
+    else:
+        # Paged: the nil UUID sorts before every holding_id, so it stands in
+        # for "from the start".
+        params["after"] = cursor or _NIL_UUID
+        params["limit"] = limit = limit or 100
+        rows = (await db.execute(_OWNED_HOLDINGS_PAGE, params)).all()
+        if len(rows) == limit:
+            response.headers["X-Next-Cursor"] = str(rows[-1].holding_id)
+    # No rows means either an empty account or someone else's; only then is
+    # a second query needed to tell the two apart.
+    if not rows and (await db.execute(_OWNS_ACCOUNT, params)).first() is None:
+        raise HTTPException(status_code=403, detail="Account not found or access denied")
+    return rows
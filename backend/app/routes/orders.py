@@ -90,8 +90,8 @@ async def place_order(
             filled_quantity=Decimal("0"),
             filled_price=None,
         )
-        async with db.begin():
-            db.add(order)
+        db.add(order)
+        await db.commit()
         await db.refresh(order)
         return order
 
@@ -170,8 +170,8 @@ async def place_order(
         filled_price=effective_price,
     )
 
-    async with db.begin():
-        db.add(order)
+    db.add(order)
+    await db.commit()
 
     await db.refresh(order)
     return order
@@ -209,8 +209,8 @@ async def cancel_order(
     order.status = "cancelled"
     order.cancelled_at = datetime.utcnow()
 
-    async with db.begin():
-        db.add(order)
+    db.add(order)
+    await db.commit()
 
     await db.refresh(order)
     return order
@@ -320,8 +320,8 @@ async def execute_order(
     order.filled_price = price
     order.executed_at = datetime.utcnow()
 
-    async with db.begin():
-        db.add(order)
+    db.add(order)
+    await db.commit()
 
     await db.refresh(order)
     return order
@@ -336,12 +336,27 @@ async def list_orders(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    query = select(Order).join(Account, Order.account_id == Account.account_id).where(
-        Account.user_id == current_user.user_id
+    # Plain rows with exactly the OrderOut columns; no ORM instances, identity
+    # map entries or loader state are built for a read-only listing.
+    query = (
+        select(
+            Order.order_id,
+            Order.account_id,
+            Order.security_id,
+            Order.order_type,
+            Order.side,
+            Order.quantity,
+            Order.price,
+            Order.status,
+            Order.filled_quantity,
+            Order.filled_price,
+        )
+        .join(Account, Order.account_id == Account.account_id)
+        .where(Account.user_id == current_user.user_id)
     )
 
     if account_id is not None:
         query = query.where(Order.account_id == account_id)
 
     result = await db.execute(query)
-    return result.scalars().all()
+    return result.all()
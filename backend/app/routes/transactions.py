@@ -88,14 +88,14 @@ async def create_transaction(
         user_agent=request.headers.get("user-agent"),
     )
 
-    async with db.begin():
-        await db.execute(
-            update(Account)
-            .where(Account.account_id == account.account_id)
-            .values(balance=new_balance)
-        )
-        db.add(new_txn)
-        db.add(audit)
+    await db.execute(
+        update(Account)
+        .where(Account.account_id == account.account_id)
+        .values(balance=new_balance)
+    )
+    db.add(new_txn)
+    db.add(audit)
+    await db.commit()
 
     await db.refresh(new_txn)
     return new_txn
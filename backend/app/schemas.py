@@ -3,7 +3,13 @@ from decimal import Decimal
 from typing import Any, Dict, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, validator
+
+
+def normalize_email(value: str) -> str:
+    # Emails are stored lowercased (ck_users_email_lowercase), so lookups
+    # are plain equality on the users.email unique index.
+    return value.lower()
 
 
 class UserBase(BaseModel):
@@ -12,6 +18,8 @@ class UserBase(BaseModel):
     last_name: Optional[str] = None
     phone: Optional[str] = None
 
+    _normalize_email = validator("email", allow_reuse=True)(normalize_email)
+
 
 class UserCreate(UserBase):
     password: str = Field(min_length=8, max_length=128)
@@ -30,6 +38,8 @@ class UserLogin(BaseModel):
     email: EmailStr
     password: str
 
+    _normalize_email = validator("email", allow_reuse=True)(normalize_email)
+
 
 class AccountCreate(BaseModel):
     account_type: str
@@ -5,4 +5,8 @@ echo "Running database migrations..."
 alembic -c /app/alembic.ini upgrade head
 
 echo "Starting application..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
+# uvloop and httptools ship with uvicorn[standard]; pin them explicitly so a
+# missing wheel fails loudly instead of silently falling back to asyncio/h11.
+exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --no-access-log \
+  --loop uvloop --http httptools \
+  --limit-concurrency 2048 --backlog 4096 --timeout-keep-alive 15
@@ -0,0 +1,46 @@
+import base64
+import os
+import sys
+
+# Ensure repo root is on PYTHONPATH so `app` package is importable
+# when tests run inside container
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.auth import (  # noqa: E402
+    create_access_token,
+    decode_access_token,
+    hash_password,
+    verify_password,
+)
+
+
+def test_password_round_trip():
+    hashed = hash_password("correct horse battery")
+    assert verify_password(hashed, "correct horse battery")
+    assert not verify_password(hashed, "wrong password")
+
+
+def test_access_token_round_trip():
+    token = create_access_token("0b6a3f8c-4a2f-4a3c-9d1d-8ad4e6a3e1b0")
+    assert decode_access_token(token) == "0b6a3f8c-4a2f-4a3c-9d1d-8ad4e6a3e1b0"
+
+
+def test_expired_token_is_rejected():
+    token = create_access_token("user", expires_minutes=-1)
+    assert decode_access_token(token) is None
+
+
+def test_tampered_token_is_rejected():
+    header, _, signature = create_access_token("user").split(".")
+    forged_payload = create_access_token("admin").split(".")[1]
+    assert decode_access_token(f"{header}.{forged_payload}.{signature}") is None
+
+
+def test_token_with_foreign_header_is_rejected():
+    _, payload, signature = create_access_token("user").split(".")
+    none_header = base64.urlsafe_b64encode(b'{"alg":"none","typ":"JWT"}')
+    header = none_header.rstrip(b"=").decode()
+    assert decode_access_token(f"{header}.{payload}.") is None
+    assert decode_access_token(f"{header}.{payload}.{signature}") is None
@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+
+# Ensure repo root is on PYTHONPATH so `app` package is importable
+# when tests run inside container
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.db import Base  # noqa: E402
+from app.models import Account, User, uuid7  # noqa: E402
+
+
+def test_each_table_is_mapped_once():
+    assert sorted(Base.metadata.tables) == [
+        "accounts",
+        "audit_log",
+        "holdings",
+        "orders",
+        "securities",
+        "transactions",
+        "users",
+    ]
+
+
+def test_account_balance_check_is_declared():
+    names = {constraint.name for constraint in Account.__table__.constraints}
+    assert "ck_accounts_balance_non_negative" in names
+
+
+def test_user_email_lowercase_check_is_declared():
+    names = {constraint.name for constraint in User.__table__.constraints}
+    assert "ck_users_email_lowercase" in names
+
+
+def test_uuid7_is_version_7_and_time_ordered():
+    first = uuid7()
+    time.sleep(0.002)
+    second = uuid7()
+    assert first.version == 7
+    assert first < second